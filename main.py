@@ -1,7 +1,19 @@
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import numpy as np
 import pandas as pd
 import yaml
-import numpy as np
+import orjson
+import xxhash
+from cachetools import LRUCache, TTLCache
 
 from services.core_quality_service import CoreQualityService
 from services.statistical_quality_service import StatisticalQualityService
@@ -11,8 +23,11 @@ from services.temporal_quality_service import TemporalQualityService
 from services.information_quality_service import InformationQualityService
 from services.precision_quality_service import PrecisionQualityService
 from services.advanced_analytics_service import AdvancedAnalyticsService
+from services.numeric_block import build_numeric_block
 
-app = FastAPI(title="Data Quality Validation API")
+# orjson writes NaN/Inf as null and serialises NumPy scalars/arrays natively,
+# so results need no Python pre-pass before encoding.
+app = FastAPI(title="Data Quality Validation API", default_response_class=ORJSONResponse)
 
 # =========================
 # Load YAML Config
@@ -20,6 +35,11 @@ app = FastAPI(title="Data Quality Validation API")
 with open("config/column_config.yaml", "r") as file:
     config = yaml.safe_load(file)
 
+# Per-request lookups resolved once at startup
+DATETIME_COLUMNS = config["datetime_columns"]
+IDENTIFIER_COLUMNS = config.get("identifier_columns", [])
+VALUE_RANGES = config["value_ranges"]
+
 # =========================
 # Initialize Services
 # =========================
@@ -32,29 +52,151 @@ info_service = InformationQualityService()
 precision_service = PrecisionQualityService()
 analytics_service = AdvancedAnalyticsService()
 
+# =========================
+# Upload Caches
+# =========================
+# Keyed by a content hash of the uploaded bytes. Frames and intermediates are
+# bounded by their size in bytes (per worker, overridable via the environment), so a
+# few large uploads cannot exhaust RAM. Results are small, so they are bounded by
+# count, and they expire because some metrics (e.g. freshness) depend on the
+# current time, not only on the file.
+def cache_nbytes(value):
+    """Approximate memory held by a cached frame, array, or container of them."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(cache_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(cache_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def cache_put(cache, key, value):
+    """Store `value` unless it alone exceeds the cache's byte budget."""
+    try:
+        cache[key] = value
+    except ValueError:
+        pass
+
+
+DATAFRAME_CACHE = LRUCache(maxsize=int(os.environ.get("DATAFRAME_CACHE_BYTES", 512 * 2**20)), getsizeof=cache_nbytes)
+# Numeric block, column summary and parsed datetimes
+DERIVED_CACHE = LRUCache(maxsize=int(os.environ.get("DERIVED_CACHE_BYTES", 512 * 2**20)), getsizeof=cache_nbytes)
+RESULT_CACHE = TTLCache(maxsize=1024, ttl=3600)
+
+# =========================
+# Metric Executor
+# =========================
+# Threads rather than processes: the metrics spend their time in pandas/NumPy C
+# loops that release the GIL, and a process pool would pickle the DataFrame per task.
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+async def run_metrics(metrics: dict, key: str):
+    """Run independent metrics concurrently; `metrics` maps name -> (callable, *args).
+
+    Results are memoised per upload content `key`, so a re-posted file only
+    computes the metrics that have not been seen for it yet.
+    """
+    loop = asyncio.get_running_loop()
+    results, pending = {}, {}
+    for name, (fn, *args) in metrics.items():
+        # Every argument derives from the upload or the static config, so content + metric is enough
+        memo_key = (key, fn.__qualname__)
+        if memo_key in RESULT_CACHE:
+            results[name] = RESULT_CACHE[memo_key]
+        else:
+            pending[name] = (memo_key, loop.run_in_executor(EXECUTOR, partial(fn, *args)))
+
+    computed = await asyncio.gather(*(future for _, future in pending.values()))
+    for (name, (memo_key, _)), value in zip(pending.items(), computed):
+        RESULT_CACHE[memo_key] = results[name] = value
+    return {name: results[name] for name in metrics}
+
+
+# Columns per executor hop when streaming; small enough for early first bytes,
+# large enough that thread hand-off does not dominate on very wide uploads.
+STREAM_BATCH = 64
+
+
+async def stream_metrics(metrics: dict, df: pd.DataFrame):
+    """Yield `{metric: {column: result}}` as JSON text, one column batch at a time.
+
+    Only for per-column metrics taking just the frame. Results are not memoised in
+    RESULT_CACHE, so the whole response is never held in memory at once.
+    """
+    yield b"{"
+    for i, (name, fn) in enumerate(metrics.items()):
+        yield (b"," if i else b"") + orjson.dumps(name) + b":{"
+        first = True
+        for start in range(0, len(df.columns), STREAM_BATCH):
+            part = await run_in_threadpool(fn, df.iloc[:, start:start + STREAM_BATCH])
+            for col, value in part.items():
+                yield (b"" if first else b",") + orjson.dumps(str(col)) + b":" + orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+                first = False
+        yield b"}"
+    yield b"}"
+
 # =========================
 # Utility: Read Uploaded File
 # =========================
-def read_file(file: UploadFile):
-    if file.filename.endswith((".xlsx", ".xls")):
-        return pd.read_excel(file.file)
-    elif file.filename.endswith(".csv"):
-        return pd.read_csv(file.file)
-    else:
+# The C parser keeps timestamp text (and so each row's UTC offset) as strings, like
+# the temporal checks expect; calamine reads both .xlsx and legacy .xls far faster
+# than openpyxl.
+READERS = {
+    ".csv": pd.read_csv,
+    ".xlsx": partial(pd.read_excel, engine="calamine"),
+    ".xls": partial(pd.read_excel, engine="calamine"),
+}
+
+
+async def read_file(file: UploadFile):
+    """Parse the upload, returning the DataFrame and a content hash of its bytes."""
+    reader = READERS.get(os.path.splitext(file.filename)[1])
+    if reader is None:
         raise HTTPException(status_code=400, detail="Only .csv, .xlsx, .xls allowed")
 
+    content = await file.read()
+    # XXH3 is SIMD-accelerated; 128 bits keeps collisions out of reach across caches
+    key = xxhash.xxh3_128_hexdigest(content)
+    df = DATAFRAME_CACHE.get(key)
+    if df is None:
+        # Parsing is blocking; keep it off the event loop so other requests keep flowing.
+        # BytesIO shares the uploaded bytes rather than copying them.
+        df = await run_in_threadpool(reader, io.BytesIO(content))
+        cache_put(DATAFRAME_CACHE, key, df)
+    return df, key
+
+
+# =========================
+# Utility: Shared intermediates per upload
+# =========================
+async def get_derived(fn, *args, key: str):
+    """Compute (or reuse, for a re-posted file) an intermediate several metrics consume."""
+    memo_key = (key, fn.__qualname__)
+    value = DERIVED_CACHE.get(memo_key)
+    if value is None:
+        value = await run_in_threadpool(fn, *args)
+        cache_put(DERIVED_CACHE, memo_key, value)
+    return value
+
+
+# =========================
+# Utility: Configured datetime columns present in the upload (config order)
+# =========================
+def get_datetime_columns(df: pd.DataFrame):
+    return [col for col in DATETIME_COLUMNS if col in df.columns]
+
 
 # =========================
-# Utility: Clean NaN values
+# Utility: Configured identifier columns present in the upload (config order)
 # =========================
-def clean_nan(obj):
-    if isinstance(obj, dict):
-        return {k: clean_nan(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_nan(i) for i in obj]
-    elif isinstance(obj, float) and (np.isnan(obj) or np.isinf(obj)):
-        return None
-    return obj
+def get_identifier_columns(df: pd.DataFrame):
+    return [col for col in IDENTIFIER_COLUMNS if col in df.columns]
 
 
 # =========================
@@ -62,19 +204,21 @@ def clean_nan(obj):
 # =========================
 @app.post("/data-quality")
 async def check_core_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
 
     numeric_columns = df.select_dtypes(include=["int", "float"]).columns.tolist()
-    datetime_columns = [col for col in config["datetime_columns"] if col in df.columns]
+    datetime_columns = get_datetime_columns(df)
+    num_arr, col_stats = await get_derived(build_numeric_block, df, numeric_columns, key=key)
 
-    return {
-        "completeness": core_service.completeness(df),
-        "consistency": core_service.consistency(df, datetime_columns),
-        "accuracy": core_service.accuracy(df, numeric_columns),
-        "validity": core_service.validity(df, config["value_ranges"]),
-        "timeliness": core_service.timeliness(df, datetime_columns),
-        "uniqueness": core_service.uniqueness(df)
-    }
+    result = await run_metrics({
+        "completeness": (core_service.completeness, df),
+        "consistency": (core_service.consistency, df, datetime_columns),
+        "accuracy": (core_service.accuracy, num_arr, numeric_columns, col_stats),
+        "validity": (core_service.validity, df, VALUE_RANGES),
+        "timeliness": (core_service.timeliness, df, datetime_columns),
+        "uniqueness": (core_service.uniqueness, df)
+    }, key)
+    return ORJSONResponse(result)
 
 
 # =========================
@@ -82,21 +226,24 @@ async def check_core_quality(file: UploadFile = File(...)):
 # =========================
 @app.post("/statistical-quality")
 async def check_statistical_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
     numeric_columns = df.select_dtypes(include=["int", "float"]).columns.tolist()
+    # Build the numeric block once; every metric below reuses it
+    num_arr, col_stats = await get_derived(build_numeric_block, df, numeric_columns, key=key)
+    col_stats = await get_derived(stat_service.column_summary, num_arr, numeric_columns, col_stats, key=key)
 
-    result = {
-        "distribution_normality": stat_service.distribution_normality(df, numeric_columns),
-        "outlier_score": stat_service.outlier_score(df, numeric_columns),
-        "variance_stability": stat_service.variance_stability(df, numeric_columns),
-        "skewness_quality": stat_service.skewness_quality(df, numeric_columns),
-        "kurtosis_quality": stat_service.kurtosis_quality(df, numeric_columns),
-        "range_conformity": stat_service.range_conformity(df, config["value_ranges"]),
-        "coefficient_variation": stat_service.coefficient_variation(df, numeric_columns),
-        "statistical_anomalies": stat_service.statistical_anomalies(df, numeric_columns)
-    }
+    result = await run_metrics({
+        "distribution_normality": (stat_service.distribution_normality, num_arr, numeric_columns, col_stats),
+        "outlier_score": (stat_service.outlier_score, num_arr, numeric_columns, col_stats),
+        "variance_stability": (stat_service.variance_stability, num_arr, numeric_columns, col_stats),
+        "skewness_quality": (stat_service.skewness_quality, num_arr, numeric_columns, col_stats),
+        "kurtosis_quality": (stat_service.kurtosis_quality, num_arr, numeric_columns, col_stats),
+        "range_conformity": (stat_service.range_conformity, df, VALUE_RANGES),
+        "coefficient_variation": (stat_service.coefficient_variation, num_arr, numeric_columns, col_stats),
+        "statistical_anomalies": (stat_service.statistical_anomalies, num_arr, numeric_columns, col_stats)
+    }, key)
 
-    return clean_nan(result)
+    return ORJSONResponse(result)
 
 
 # =========================
@@ -104,94 +251,118 @@ async def check_statistical_quality(file: UploadFile = File(...)):
 # =========================
 @app.post("/structural-quality")
 async def check_structural_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
+    identifier_columns = get_identifier_columns(df)
 
-    result = {
-        "schema_conformity": struct_service.schema_conformity(df),
-        "data_type_consistency": struct_service.data_type_consistency(df),
-        "naming_convention": struct_service.naming_convention(df),
-        "structural_integrity": struct_service.structural_integrity(df),
-        "cardinality_quality": struct_service.cardinality_quality(df),
-        "schema_drift": struct_service.schema_drift(df),
-        "metadata_completeness": struct_service.metadata_completeness(df)
-    }
+    result = await run_metrics({
+        "schema_conformity": (struct_service.schema_conformity, df),
+        "data_type_consistency": (struct_service.data_type_consistency, df),
+        "naming_convention": (struct_service.naming_convention, df),
+        "structural_integrity": (struct_service.structural_integrity, df, identifier_columns),
+        "cardinality_quality": (struct_service.cardinality_quality, df, identifier_columns),
+        "schema_drift": (struct_service.schema_drift, df),
+        "metadata_completeness": (struct_service.metadata_completeness, df)
+    }, key)
 
-    return clean_nan(result)
+    return ORJSONResponse(result)
 
 
 @app.post("/semantic-quality")
 async def check_semantic_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
+    identifier_columns = get_identifier_columns(df)
 
-    result = {
-        "business_rule_compliance": semantic_service.business_rule_compliance(df),
-        "referential_integrity": semantic_service.referential_integrity(df),
-        "cross_field_validation": semantic_service.cross_field_validation(df),
-        "domain_value_validity": semantic_service.domain_value_validity(df),
-        "semantic_consistency": semantic_service.semantic_consistency(df),
-        "data_lineage_quality": semantic_service.data_lineage_quality(df)
-    }
+    result = await run_metrics({
+        "business_rule_compliance": (semantic_service.business_rule_compliance, df),
+        "referential_integrity": (semantic_service.referential_integrity, df, identifier_columns),
+        "cross_field_validation": (semantic_service.cross_field_validation, df),
+        "domain_value_validity": (semantic_service.domain_value_validity, df),
+        "semantic_consistency": (semantic_service.semantic_consistency, df),
+        "data_lineage_quality": (semantic_service.data_lineage_quality, df)
+    }, key)
 
-    return clean_nan(result)
+    return ORJSONResponse(result)
 
 
 @app.post("/temporal-quality")
 async def check_temporal_quality(file: UploadFile = File(...)):
-    df = read_file(file)
-    datetime_columns = [col for col in config["datetime_columns"] if col in df.columns]
-
-    temporal_service = TemporalQualityService()
-    result = {
-        "timestamp_accuracy": temporal_service.timestamp_accuracy(df, datetime_columns),
-        "temporal_continuity": temporal_service.temporal_continuity(df, datetime_columns),
-        "time_zone_consistency": temporal_service.time_zone_consistency(df, datetime_columns),
-        "temporal_granularity": temporal_service.temporal_granularity(df, datetime_columns),
-        "freshness_score": temporal_service.freshness_score(df, datetime_columns),
-        "temporal_pattern": temporal_service.temporal_pattern(df, datetime_columns),
-        "seasonality_detection": temporal_service.seasonality_detection(df, datetime_columns)
-    }
-    return result
+    df, key = await read_file(file)
+    datetime_columns = get_datetime_columns(df)
+    # Parse each datetime column once; every metric below reuses the parsed Series
+    parsed = await get_derived(temporal_service.parse_datetimes, df, datetime_columns, key=key)
+
+    result = await run_metrics({
+        "timestamp_accuracy": (temporal_service.timestamp_accuracy, parsed),
+        "temporal_continuity": (temporal_service.temporal_continuity, parsed),
+        "time_zone_consistency": (temporal_service.time_zone_consistency, parsed),
+        "temporal_granularity": (temporal_service.temporal_granularity, parsed),
+        "freshness_score": (temporal_service.freshness_score, parsed),
+        "temporal_pattern": (temporal_service.temporal_pattern, parsed),
+        "seasonality_detection": (temporal_service.seasonality_detection, parsed)
+    }, key)
+    return ORJSONResponse(result)
 
 
 @app.post("/information-quality")
 async def check_information_quality(file: UploadFile = File(...)):
-    df = read_file(file)
-    info_service = InformationQualityService()
-
-    result = {
-        "entropy_score": info_service.entropy_score(df),
-        "information_density": info_service.information_density(df),
-        "sparsity_score": info_service.sparsity_score(df),
-        "redundancy_score": info_service.redundancy_score(df),
-        "compression_ratio": info_service.compression_ratio(df)
-    }
-    return result
+    df, _ = await read_file(file)
+
+    # Every metric here is per column; stream them so wide uploads start responding at once
+    return StreamingResponse(stream_metrics({
+        "entropy_score": info_service.entropy_score,
+        "information_density": info_service.information_density,
+        "sparsity_score": info_service.sparsity_score,
+        "redundancy_score": info_service.redundancy_score,
+        "compression_ratio": info_service.compression_ratio
+    }, df), media_type="application/json")
 
 @app.post("/precision-quality")
 async def check_precision_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
     numeric_columns = df.select_dtypes(include=["int", "float"]).columns.tolist()
+    num_arr, col_stats = await get_derived(build_numeric_block, df, numeric_columns, key=key)
 
-    return {
-        "decimal_precision": precision_service.decimal_precision(df, numeric_columns),
-        "rounding_consistency": precision_service.rounding_consistency(df, numeric_columns),
-        "significant_figures": precision_service.significant_figures(df, numeric_columns),
-        "measurement_precision": precision_service.measurement_precision(df, numeric_columns),
-        "calculation_accuracy": precision_service.calculation_accuracy(df, ["col1", "col2", "col3"])
-    }
+    result = await run_metrics({
+        "decimal_precision": (precision_service.decimal_precision, num_arr, numeric_columns, col_stats),
+        "rounding_consistency": (precision_service.rounding_consistency, num_arr, numeric_columns, col_stats),
+        "significant_figures": (precision_service.significant_figures, num_arr, numeric_columns, col_stats),
+        "measurement_precision": (precision_service.measurement_precision, num_arr, numeric_columns, col_stats),
+        "calculation_accuracy": (precision_service.calculation_accuracy, df, ["col1", "col2", "col3"])
+    }, key)
+    return ORJSONResponse(result)
 
 
 @app.post("/advanced-analytics")
 async def advanced_analytics_quality(file: UploadFile = File(...)):
-    df = read_file(file)
+    df, key = await read_file(file)
     numeric_columns = df.select_dtypes(include=["int", "float"]).columns.tolist()
+    # Build the numeric block once; every metric below reuses it
+    num_arr, col_stats = await get_derived(build_numeric_block, df, numeric_columns, key=key)
+
+    result = await run_metrics({
+        "correlation_quality": (analytics_service.correlation_quality, num_arr, numeric_columns, col_stats),
+        "trend_consistency": (analytics_service.trend_consistency, num_arr, numeric_columns, col_stats),
+        "volatility_score": (analytics_service.volatility_score, num_arr, numeric_columns, col_stats),
+        "rate_of_change": (analytics_service.rate_of_change, num_arr, numeric_columns, col_stats),
+        "anomaly_score": (analytics_service.anomaly_score, num_arr, numeric_columns, col_stats),
+        "predictability_score": (analytics_service.predictability_score, num_arr, numeric_columns, col_stats)
+    }, key)
+    return ORJSONResponse(result)
 
-    result = {
-        "correlation_quality": analytics_service.correlation_quality(df, numeric_columns),
-        "trend_consistency": analytics_service.trend_consistency(df, numeric_columns),
-        "volatility_score": analytics_service.volatility_score(df, numeric_columns),
-        "rate_of_change": analytics_service.rate_of_change(df, numeric_columns),
-        "anomaly_score": analytics_service.anomaly_score(df, numeric_columns),
-        "predictability_score": analytics_service.predictability_score(df, numeric_columns)
-    }
-    return clean_nan(result)
+
+# =========================
+# Entrypoint
+# =========================
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" resolves to uvloop + httptools (installed via uvicorn[standard]) and
+    # falls back to asyncio / h11 on platforms without them, e.g. Windows.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=int(os.getenv("WEB_CONCURRENCY", 4)),
+        loop="auto",
+        http="auto",
+    )
@@ -1,20 +1,38 @@
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+
+from services.numeric_block import zscore_outlier_counts
 
 class AdvancedAnalyticsService:
-    """Advanced Data Analytics Metrics for numerical columns in a DataFrame."""
+    """Advanced Data Analytics Metrics for numerical columns in a DataFrame.
+
+    Metrics take the numeric block built once per request by `build_numeric_block`:
+    `num_arr` (rows x numeric_columns, float64) and, where needed, its shared `col_stats`.
+    """
+
+    def _ffill(self, num_arr, valid):
+        """Forward-fill gaps column-wise; leading gaps stay NaN."""
+        last_valid = np.where(valid, np.arange(len(num_arr))[:, None], 0)
+        np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+        return num_arr[last_valid, np.arange(num_arr.shape[1])]
 
-    def correlation_quality(self, df, numeric_columns):
+    def correlation_quality(self, num_arr, numeric_columns, col_stats):
         """Check correlation strength between numeric columns."""
         try:
-            df = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
-            corr = df.corr().abs()
             n = len(numeric_columns)
             if n < 2:
                 return None
 
+            if not col_stats["valid"].all():
+                # Missing values need pandas' pairwise-complete correlation
+                corr = pd.DataFrame(num_arr).corr().to_numpy()
+            else:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    corr = np.corrcoef(num_arr, rowvar=False)
+
             # Count strong correlations (unique pairs only, exclude diagonal)
-            strong_pairs = np.sum(np.triu(corr > 0.7, k=1))
+            strong_pairs = np.count_nonzero(np.abs(corr[np.triu_indices(n, k=1)]) > 0.7)
             total_pairs = n * (n - 1) / 2
 
             score = (strong_pairs / total_pairs) * 100 if total_pairs else 0
@@ -23,35 +41,39 @@ class AdvancedAnalyticsService:
             print(f"[correlation_quality] Error: {e}")
             return None
 
-    def trend_consistency(self, df, numeric_columns):
+    def trend_consistency(self, num_arr, numeric_columns, col_stats):
         """Detect upward or downward trend consistency."""
         try:
-            trends = {}
-            for col in numeric_columns:
-                series = pd.to_numeric(df[col], errors='coerce')
-                if series.isnull().all():
-                    continue
-                x = np.arange(len(series))
-                y = series.fillna(method='ffill')
-                coef = np.polyfit(x, y, 1)[0]  # slope
-                trends[col] = coef
-
-            if not trends:
+            # Forward-filled like before; only leading gaps remain and are masked out of the fit
+            values = self._ffill(num_arr, col_stats["valid"])
+            mask = ~np.isnan(values)
+            count = mask.sum(axis=0)
+            present = count > 0
+            if not present.any():
                 return None
 
-            consistent = sum(1 for val in trends.values() if abs(val) > 0.01)
-            return round((consistent / len(trends)) * 100, 2)
+            # Least-squares slope of every column against the row index in one pass
+            x = np.arange(len(values), dtype=np.float64)[:, None]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                x_mean = (x * mask).sum(axis=0) / count
+                y_mean = bn.nanmean(values, axis=0)
+                x_dev = np.where(mask, x - x_mean, 0)
+                slopes = np.nansum(x_dev * (values - y_mean), axis=0) / (x_dev ** 2).sum(axis=0)
+
+            consistent = np.count_nonzero(np.abs(slopes[present]) > 0.01)
+            return round((consistent / present.sum()) * 100, 2)
         except Exception as e:
             print(f"[trend_consistency] Error: {e}")
             return None
 
-    def volatility_score(self, df, numeric_columns):
+    def volatility_score(self, num_arr, numeric_columns, col_stats):
         """Calculate volatility using coefficient of variation (std/mean)."""
         try:
-            df_num = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
-            means = df_num.mean().replace(0, np.nan)
-            vols = (df_num.std() / means).replace([np.inf, -np.inf], np.nan).dropna()
-            if vols.empty:
+            means = np.where(col_stats["mean"] == 0, np.nan, col_stats["mean"])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                vols = col_stats["std"] / means
+            vols = vols[np.isfinite(vols)]
+            if vols.size == 0:
                 return None
             avg_vol = vols.mean()
             return round((1 - avg_vol) * 100, 2)
@@ -59,28 +81,30 @@ class AdvancedAnalyticsService:
             print(f"[volatility_score] Error: {e}")
             return None
 
-    def rate_of_change(self, df, numeric_columns):
+    def rate_of_change(self, num_arr, numeric_columns, col_stats):
         """Average percentage rate of change between rows."""
-        roc = {}
-        for col in numeric_columns:
-            try:
-                series = pd.to_numeric(df[col], errors='coerce')
-                pct = series.pct_change().replace([np.inf, -np.inf], np.nan).dropna()
-                roc[col] = round(pct.mean() * 100, 2) if len(pct) else None
-            except Exception as e:
-                print(f"[rate_of_change] Error in column {col}: {e}")
-                roc[col] = None
-        return roc
-
-    def anomaly_score(self, df, numeric_columns):
+        try:
+            # pct_change semantics: gaps are forward-filled, inf/NaN changes are ignored
+            values = self._ffill(num_arr, col_stats["valid"])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pct = values[1:] / values[:-1] - 1
+                finite = np.isfinite(pct)
+                means = np.where(finite, pct, 0).sum(axis=0) / finite.sum(axis=0)
+            return {
+                col: round(mean * 100, 2) if n else None
+                for col, mean, n in zip(numeric_columns, means, finite.sum(axis=0))
+            }
+        except Exception as e:
+            print(f"[rate_of_change] Error: {e}")
+            return {col: None for col in numeric_columns}
+
+    def anomaly_score(self, num_arr, numeric_columns, col_stats):
         """Simple anomaly detection using Z-score method."""
         try:
-            df_num = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
-            mean = df_num.mean()
-            std = df_num.std().replace(0, np.nan)
-            z_scores = np.abs((df_num - mean) / std)
-            anomalies = (z_scores > 3).sum().sum()
-            valid_values = df_num.count().sum()
+            # A constant column has no z-scores, so its zero std is treated as missing
+            std = np.where(col_stats["std"] == 0, np.nan, col_stats["std"])
+            anomalies = zscore_outlier_counts(num_arr, col_stats["mean"], std).sum()
+            valid_values = col_stats["count"].sum()
             if valid_values == 0:
                 return None
             score = (1 - (anomalies / valid_values)) * 100
@@ -89,19 +113,25 @@ class AdvancedAnalyticsService:
             print(f"[anomaly_score] Error: {e}")
             return None
 
-    def predictability_score(self, df, numeric_columns):
+    def predictability_score(self, num_arr, numeric_columns, col_stats):
         """Check predictability using autocorrelation (lag=1)."""
         try:
-            scores = []
-            for col in numeric_columns:
-                series = pd.to_numeric(df[col], errors='coerce').dropna()
-                if len(series) < 2:
-                    continue
-                score = series.autocorr(lag=1)
-                if not np.isnan(score):
-                    scores.append(abs(score))
-            return round(np.mean(scores) * 100, 2) if scores else None
+            current = num_arr
+            # Pair each value with the previous non-null one, i.e. lag 1 of the dropna()'d series
+            previous = np.full_like(num_arr, np.nan)
+            previous[1:] = self._ffill(num_arr, col_stats["valid"])[:-1]
+            mask = col_stats["valid"] & ~np.isnan(previous)
+            count = mask.sum(axis=0)
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cur_dev = np.where(mask, current - np.where(mask, current, 0).sum(axis=0) / count, 0)
+                prev_dev = np.where(mask, previous - np.where(mask, previous, 0).sum(axis=0) / count, 0)
+                scores = (cur_dev * prev_dev).sum(axis=0) / np.sqrt(
+                    (cur_dev ** 2).sum(axis=0) * (prev_dev ** 2).sum(axis=0)
+                )
+
+            scores = np.abs(scores[np.isfinite(scores)])
+            return round(np.mean(scores) * 100, 2) if scores.size else None
         except Exception as e:
             print(f"[predictability_score] Error: {e}")
             return None
-
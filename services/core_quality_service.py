@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+
+from services.numeric_block import zscore_outlier_counts
 
 
 class CoreQualityService:
@@ -25,11 +28,13 @@ class CoreQualityService:
             }
         return result
 
-    def accuracy(self, df: pd.DataFrame, numeric_columns: list):
+    def accuracy(self, num_arr: np.ndarray, numeric_columns: list, col_stats: dict):
         result = {}
-        for col in numeric_columns:
-            z_scores = (df[col] - df[col].mean()) / df[col].std(ddof=0)
-            outliers_ratio = (np.abs(z_scores) > 3).mean() * 100
+        mean = col_stats["mean"]
+        # Population std (ddof=0), unlike the shared sample std
+        std = bn.nanstd(num_arr, axis=0)
+        ratios = zscore_outlier_counts(num_arr, mean, std) / len(num_arr) * 100
+        for col, outliers_ratio in zip(numeric_columns, ratios):
             result[col] = {
                 "outlier_%": round(outliers_ratio, 2),
                 "status": "Issue" if outliers_ratio > 10 else "OK"
@@ -50,15 +55,19 @@ class CoreQualityService:
     def timeliness(self, df: pd.DataFrame, datetime_columns: list):
         result = {}
         for col in datetime_columns:
-            df[col] = pd.to_datetime(df[col], errors='ignore')
-            if df[col].dtype == 'datetime64[ns]':
-                gaps = df[col].sort_values().diff().dt.total_seconds().dropna()
-                if not gaps.empty:
-                    median_gap = gaps.median()
-                    large_gaps = gaps[gaps > (median_gap * 3)]
+            times = pd.to_datetime(df[col], errors='ignore')
+            if pd.api.types.is_datetime64_dtype(times):
+                # Gaps in int64 nanoseconds; the unit cancels in the median comparison
+                ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+                ns = ns[ns != np.iinfo(np.int64).min]  # drop NaT
+                ns.sort()
+                gaps = np.diff(ns)
+                if gaps.size:
+                    median_gap = np.median(gaps)
+                    large_gaps = int(np.count_nonzero(gaps > (median_gap * 3)))
                     result[col] = {
-                        "large_gaps": int(len(large_gaps)),
-                        "status": "Issue" if len(large_gaps) > 0 else "OK"
+                        "large_gaps": large_gaps,
+                        "status": "Issue" if large_gaps > 0 else "OK"
                     }
         return result
 
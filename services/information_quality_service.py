@@ -11,13 +11,14 @@ class InformationQualityService:
         results = {}
         for col in df.columns:
             try:
-                series = df[col].dropna().astype(str)
-                if len(series) == 0:
+                # Hash the native dtype; value_counts already skips nulls
+                counts = df[col].value_counts().to_numpy()
+                if counts.size == 0:
                     results[col] = {"entropy_score": 0, "status": "Low entropy"}
                     continue
 
-                probs = series.value_counts(normalize=True)
-                entropy = -np.sum(probs * np.log2(probs))
+                probs = counts / counts.sum()
+                entropy = -np.dot(probs, np.log2(probs))
                 max_entropy = math.log2(len(probs)) if len(probs) > 1 else 1
                 normalized_entropy = round(entropy / max_entropy, 3)
                 results[col] = {
@@ -31,10 +32,10 @@ class InformationQualityService:
     # 36. Information Density — ratio of non-null cells
     def information_density(self, df):
         results = {}
-        for col in df.columns:
+        # Non-null counts for every column in one columnar reduction
+        total, non_nulls = len(df), df.notna().sum()
+        for col, non_null in non_nulls.items():
             try:
-                total = len(df[col])
-                non_null = df[col].notna().sum()
                 density = round((non_null / total) * 100, 2) if total > 0 else 0
                 results[col] = {
                     "information_density_%": density,
@@ -47,10 +48,9 @@ class InformationQualityService:
     # 37. Sparsity Score — complement of density
     def sparsity_score(self, df):
         results = {}
-        for col in df.columns:
+        total, non_nulls = len(df), df.notna().sum()
+        for col, non_null in non_nulls.items():
             try:
-                total = len(df[col])
-                non_null = df[col].notna().sum()
                 density = (non_null / total) * 100 if total > 0 else 0
                 sparsity = round(100 - density, 2)
                 results[col] = {"sparsity_%": sparsity}
@@ -63,7 +63,9 @@ class InformationQualityService:
         results = {}
         for col in df.columns:
             try:
-                dup_ratio = df[col].duplicated().mean() * 100
+                # Duplicates = rows - distinct values (NaN counted once), one hash pass, no mask
+                n = len(df[col])
+                dup_ratio = (1 - df[col].nunique(dropna=False) / n) * 100 if n else np.nan
                 redundancy = round(100 - dup_ratio, 2)
                 results[col] = {
                     "redundancy_%": redundancy,
@@ -78,8 +80,11 @@ class InformationQualityService:
         results = {}
         for col in df.columns:
             try:
-                series = df[col].dropna().astype(str)
-                unique_ratio = len(series.unique()) / len(series) if len(series) > 0 else 0
+                # Same single hash pass on the native dtype; null groups are excluded
+                counts = df[col].value_counts(dropna=False)
+                nulls = counts.index.isna()
+                non_null = counts[~nulls].sum()
+                unique_ratio = (len(counts) - nulls.sum()) / non_null if non_null > 0 else 0
                 compression = round((1 - unique_ratio) * 100, 2)
                 results[col] = {
                     "compression_ratio_%": compression,
@@ -0,0 +1,30 @@
+import pandas as pd
+import numpy as np
+import bottleneck as bn
+
+
+def build_numeric_block(df: pd.DataFrame, numeric_columns: list):
+    """Lay the numeric columns out once as a float64 array plus the column stats metrics share."""
+    # Columns come from select_dtypes(int/float), so no to_numeric re-parse is needed
+    num_arr = df[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(num_arr)
+    count = valid.sum(axis=0)
+
+    # bottleneck's nan-reductions are single C loops per column; nanstd is the
+    # centred two-pass form, so it stays stable on large cumulative readings
+    mean = bn.nanmean(num_arr, axis=0)
+    std = bn.nanstd(num_arr, axis=0, ddof=1)
+
+    # Source dtype is lost in the float64 block; precision metrics still need it
+    integer = np.array([pd.api.types.is_integer_dtype(df[col]) for col in numeric_columns], dtype=bool)
+
+    col_stats = {"valid": valid, "count": count, "mean": mean, "std": std, "integer": integer}
+    return num_arr, col_stats
+
+
+def zscore_outlier_counts(num_arr: np.ndarray, mean: np.ndarray, std: np.ndarray):
+    """Per column, how many values lie more than three standard deviations from the mean."""
+    # |x - mean| > 3 * std is the |z| > 3 test without materialising z; NaN values
+    # (and a NaN std) compare False, so they are never counted
+    with np.errstate(invalid='ignore'):
+        return np.count_nonzero(np.abs(num_arr - mean) > 3 * std, axis=0)
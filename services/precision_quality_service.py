@@ -1,76 +1,78 @@
 import pandas as pd
 import numpy as np
-import math
 
 class PrecisionQualityService:
 
-    def _convert_to_python_types(self, obj):
-        """Recursively convert numpy types to native Python types and handle NaN/Inf"""
-        if isinstance(obj, dict):
-            return {k: self._convert_to_python_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_to_python_types(item) for item in obj]
-        elif isinstance(obj, (np.integer, np.int32, np.int64)):
-            return int(obj)
-        elif isinstance(obj, (np.floating, np.float32, np.float64)):
-            # Handle NaN and Inf values
-            if pd.isna(obj) or math.isnan(obj):
-                return None
-            elif math.isinf(obj):
-                return None
-            else:
-                return float(obj)
-        elif isinstance(obj, (np.bool_)):
-            return bool(obj)
-        elif isinstance(obj, (np.ndarray)):
-            return self._convert_to_python_types(obj.tolist())
-        elif pd.isna(obj):  # Handle pandas NA, NaT, etc.
-            return None
-        else:
-            return obj
+    def _decimal_places(self, vals, integer):
+        """Digits after the decimal point of each value, exactly as str(x) renders them"""
+        if integer:
+            return np.zeros(len(vals), dtype=np.int64)
 
-    def decimal_precision(self, df, numeric_columns: list):
+        # str() of a float always shows at least one decimal ("5.0")
+        counts = np.ones(len(vals), dtype=np.int64)
+        magnitude = np.abs(vals)
+        # Outside this band repr switches to scientific notation (or inf), so format those directly
+        formatted = ~((magnitude < 1e16) & ((magnitude >= 1e-4) | (magnitude == 0)))
+
+        # Find the shortest rounding that reproduces the value, narrowing to unresolved values each step.
+        # The rounding test is only exact while |x| * 10**k stays below 2**53; beyond that its error
+        # can report one digit too many, so those values are handed to the string path instead
+        formatted |= magnitude * 10.0 >= 2.0 ** 53
+        pending = np.flatnonzero((np.round(vals, 1) != vals) & ~formatted)
+        for k in range(2, 11):
+            unsafe = magnitude[pending] * 10.0 ** k >= 2.0 ** 53
+            formatted[pending[unsafe]] = True
+            pending = pending[~unsafe]
+            if pending.size == 0:
+                break
+            counts[pending] = k
+            pending = pending[np.round(vals[pending], k) != vals[pending]]
+
+        # Long tails and non-decimal reprs: count on the C-formatted strings
+        pending = np.union1d(pending, np.flatnonzero(formatted))
+        if pending.size:
+            text = vals[pending].astype(str)
+            point = np.strings.find(text, ".")
+            counts[pending] = np.where(point >= 0, np.strings.str_len(text) - point - 1, 0)
+        return counts
+
+    def decimal_precision(self, num_arr, numeric_columns: list, col_stats: dict):
         result = {}
-        for col in numeric_columns:
+        for j, col in enumerate(numeric_columns):
             try:
                 # Handle NaN values in the column
-                clean_col = df[col].dropna()
-                if clean_col.empty:
+                clean_col = num_arr[col_stats["valid"][:, j], j]
+                if clean_col.size == 0:
                     result[col] = {
                         "unique_decimal_counts": [],
                         "status": "No data"
                     }
                     continue
                     
-                decimals = (
-                    clean_col
-                    .apply(lambda x: str(x) if pd.notnull(x) else None)
-                    .dropna()
-                    .apply(lambda x: len(x.split(".")[1]) if "." in x else 0)
-                )
-                unique_decimal_counts = sorted(decimals.unique().tolist())
+                decimals = self._decimal_places(clean_col, col_stats["integer"][j])
+                unique_decimal_counts = np.unique(decimals).tolist()
                 result[col] = {
                     "unique_decimal_counts": unique_decimal_counts,
                     "status": "Issue" if len(unique_decimal_counts) > 3 else "OK"
                 }
             except Exception as e:
                 result[col] = {"error": str(e), "status": "Error"}
-        return self._convert_to_python_types(result)
+        return result
 
-    def rounding_consistency(self, df, numeric_columns: list):
+    def rounding_consistency(self, num_arr, numeric_columns: list, col_stats: dict):
         result = {}
-        for col in numeric_columns:
+        for j, col in enumerate(numeric_columns):
             try:
                 # Handle NaN values
-                clean_col = df[col].dropna()
-                if clean_col.empty:
+                clean_col = num_arr[col_stats["valid"][:, j], j]
+                if clean_col.size == 0:
                     result[col] = {
                         "match_%": 0.0,
                         "status": "No data"
                     }
                     continue
                     
-                rounded = clean_col.round()
+                rounded = np.round(clean_col)
                 match_ratio = (np.isclose(clean_col, rounded) | np.isclose(clean_col * 2, np.round(clean_col * 2))).mean() * 100
                 result[col] = {
                     "match_%": round(float(match_ratio), 2),
@@ -78,62 +80,49 @@ class PrecisionQualityService:
                 }
             except Exception as e:
                 result[col] = {"error": str(e), "status": "Error"}
-        return self._convert_to_python_types(result)
+        return result
+
+    def significant_figures(self, num_arr, numeric_columns: list, col_stats: dict):
+        def has_two_sig_figs(vals):
+            # Vectorised len(f"{x:.10f}".rstrip('0').replace('.', '').lstrip('0')) >= 2
+            finite = np.isfinite(vals)
+            # The minus sign or a two-digit integer part already makes two characters
+            ok = finite & (np.signbit(vals) | (vals >= 10))
+            small = finite & ~ok
+            # Below 10 the string is the 10-decimal digits: it fails only for 0 or d * 10**k
+            digits = np.rint(vals[small] * 1e10)
+            scale = 10.0 ** np.floor(np.log10(digits, where=digits > 0, out=np.zeros_like(digits)))
+            ok[small] = (digits >= 1e11) | ((digits > 0) & (np.fmod(digits, scale) != 0))
+            return ok
 
-    def significant_figures(self, df, numeric_columns: list):
-        def count_sig_figs(x):
-            try:
-                # Handle NaN and infinite values
-                if pd.isna(x) or math.isinf(x):
-                    return 0
-                s = f"{x:.10f}".rstrip('0').replace('.', '').lstrip('0')
-                return len(s)
-            except Exception:
-                return 0
-                
         result = {}
-        for col in numeric_columns:
+        for j, col in enumerate(numeric_columns):
             try:
                 # Handle NaN values
-                clean_col = df[col].dropna()
-                if clean_col.empty:
+                clean_col = num_arr[col_stats["valid"][:, j], j]
+                if clean_col.size == 0:
                     result[col] = {
                         "valid_%": 0.0,
                         "status": "No data"
                     }
                     continue
                     
-                sig_figs = clean_col.apply(count_sig_figs)
-                valid_ratio = (sig_figs >= 2).mean() * 100
+                valid_ratio = has_two_sig_figs(clean_col).mean() * 100
                 result[col] = {
                     "valid_%": round(float(valid_ratio), 2),
                     "status": "Issue" if valid_ratio < 85 else "OK"
                 }
             except Exception as e:
                 result[col] = {"error": str(e), "status": "Error"}
-        return self._convert_to_python_types(result)
+        return result
 
-    def measurement_precision(self, df, numeric_columns: list):
+    def measurement_precision(self, num_arr, numeric_columns: list, col_stats: dict):
         result = {}
-        for col in numeric_columns:
+        for j, col in enumerate(numeric_columns):
             try:
                 # Handle NaN values
-                clean_col = df[col].dropna()
-                if clean_col.empty:
-                    result[col] = {
-                        "most_common_decimals": None,
-                        "precision_%": 0.0,
-                        "status": "No data"
-                    }
-                    continue
-                    
-                decimals = (
-                    clean_col
-                    .apply(lambda x: str(x) if pd.notnull(x) else None)
-                    .dropna()
-                    .apply(lambda x: len(x.split(".")[1]) if "." in x else 0)
-                )
-                if decimals.empty:
+                clean_col = num_arr[col_stats["valid"][:, j], j]
+                if clean_col.size == 0:
                     result[col] = {
                         "most_common_decimals": None,
                         "precision_%": 0.0,
@@ -141,16 +130,18 @@ class PrecisionQualityService:
                     }
                     continue
                     
-                most_common = decimals.mode()[0] if not decimals.empty else None
-                ratio = (decimals == most_common).mean() * 100 if most_common is not None else 0
+                decimals = self._decimal_places(clean_col, col_stats["integer"][j])
+                # Ties resolve to the smallest count, as Series.mode() did
+                most_common = np.bincount(decimals).argmax()
+                ratio = (decimals == most_common).mean() * 100
                 result[col] = {
-                    "most_common_decimals": int(most_common) if most_common is not None else None,
+                    "most_common_decimals": int(most_common),
                     "precision_%": round(float(ratio), 2),
                     "status": "Issue" if ratio < 90 else "OK"
                 }
             except Exception as e:
                 result[col] = {"error": str(e), "status": "Error"}
-        return self._convert_to_python_types(result)
+        return result
 
     def calculation_accuracy(self, df, base_cols: list = None):
         if not base_cols or len(base_cols) != 3:
@@ -171,9 +162,9 @@ class PrecisionQualityService:
                 }
                 
             valid = np.isclose(clean_df[col1] + clean_df[col2], clean_df[col3], atol=0.01).mean() * 100
-            return self._convert_to_python_types({
+            return {
                 "accuracy_%": round(float(valid), 2),
                 "status": "Issue" if valid < 92 else "OK"
-            })
+            }
         except Exception as e:
             return {"error": str(e), "status": "Error"}
\ No newline at end of file
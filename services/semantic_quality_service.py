@@ -12,6 +12,14 @@ class SemanticQualityService:
         self.frequency_columns = config.get("frequency_columns", [])
         self.powerfactor_columns = config.get("powerfactor_columns", [])
 
+        # Numeric [min, max] domain rules resolved once to float64 bounds
+        self.domain_bounds = {
+            col: (np.float64(rule[0]), np.float64(rule[1]))
+            for col, rule in self.domain_rules.items()
+            if isinstance(rule, list) and len(rule) == 2
+            and all(isinstance(bound, (int, float)) for bound in rule)
+        }
+
     #  Business Rule Compliance → Rule validation
     def business_rule_compliance(self, df: pd.DataFrame):
         freq_cols = [col for col in self.frequency_columns if col in df.columns]
@@ -27,9 +35,9 @@ class SemanticQualityService:
 
         #  Power Factor validation
         for col in pf_cols:
-            invalid_pf = df[(df[col] < -1) | (df[col] > 1)]
-            if not invalid_pf.empty:
-                rule_violations += len(invalid_pf)
+            # Count the out-of-range rows from the mask alone; no filtered frame is built
+            values = df[col]
+            rule_violations += int(((values < -1) | (values > 1)).sum())
 
         total_rules = len(freq_cols) + len(pf_cols)
         compliance_score = 1 - (rule_violations / (total_rules + 1e-6))
@@ -42,27 +50,36 @@ class SemanticQualityService:
         }
 
     #  Referential Integrity
-    def referential_integrity(self, df: pd.DataFrame):
+    def referential_integrity(self, df: pd.DataFrame, identifier_columns: list):
         inconsistent = []
-        for col in self.identifier_columns:
-            if col in df.columns:
-                null_ratio = df[col].isna().mean()
-                if null_ratio > 0.05:
-                    inconsistent.append(col)
+        for col in identifier_columns:
+            null_ratio = df[col].isna().mean()
+            if null_ratio > 0.05:
+                inconsistent.append(col)
         score = 1 - (len(inconsistent) / len(self.identifier_columns)) if self.identifier_columns else 1
         status = "Issue" if score < 0.95 else "OK"
         return {"inconsistent_columns": inconsistent, "integrity_score": round(score, 2), "status": status}
 
 
     def cross_field_validation(self, df: pd.DataFrame):
-        issues = []
-
-        for pair in self.cross_field_rules:
-            if len(pair) == 2 and all(col in df.columns for col in pair):
-                # Compare: first column should NOT be greater than second
-                inconsistent_rows = (df[pair[0]] > df[pair[1]]).sum()
-                if inconsistent_rows > 0:
-                    issues.append(f"{pair[0]}>{pair[1]}")
+        pairs = [tuple(pair) for pair in self.cross_field_rules
+                 if len(pair) == 2 and all(col in df.columns for col in pair)]
+        is_numeric = pd.api.types.is_numeric_dtype
+        numeric = [is_numeric(df[left]) and is_numeric(df[right]) for left, right in pairs]
+
+        # Compare: first column should NOT be greater than second. Numeric pairs are
+        # stacked side by side and checked in one sweep (NaN compares False, as in pandas)
+        violated = dict.fromkeys(pairs, False)
+        numeric_pairs = [pair for pair, flag in zip(pairs, numeric) if flag]
+        if numeric_pairs:
+            left = df[[a for a, _ in numeric_pairs]].to_numpy(dtype=np.float64, na_value=np.nan)
+            right = df[[b for _, b in numeric_pairs]].to_numpy(dtype=np.float64, na_value=np.nan)
+            violated.update(zip(numeric_pairs, (left > right).any(axis=0)))
+        for pair, flag in zip(pairs, numeric):
+            if not flag:
+                violated[pair] = (df[pair[0]] > df[pair[1]]).sum() > 0
+
+        issues = [f"{a}>{b}" for a, b in pairs if violated[(a, b)]]
 
         score = 1 - (len(issues) / max(len(self.cross_field_rules), 1))
         status = "Issue" if score < 0.9 else "OK"
@@ -81,13 +98,22 @@ class SemanticQualityService:
             if col in df.columns:
                 # Numeric range-based rule → [min, max]
                 if isinstance(rule, list) and len(rule) == 2:
-                    min_val, max_val = rule
-                    if ((df[col] < min_val) | (df[col] > max_val)).any():
+                    values = df[col]
+                    if col in self.domain_bounds and isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+                        # Numeric bounds on a NumPy numeric column: compare the raw array
+                        min_val, max_val = self.domain_bounds[col]
+                        arr = values.to_numpy()
+                        out_of_range = np.any((arr < min_val) | (arr > max_val))
+                    else:
+                        # Anything else keeps pandas semantics (NaN/NA compare False)
+                        min_val, max_val = rule
+                        out_of_range = ((values < min_val) | (values > max_val)).any()
+                    if out_of_range:
                         invalid_columns.append(col)
 
                 # Category-based rule (allowed values)
                 else:
-                    if (~df[col].isin(rule)).any():
+                    if not df[col].isin(rule).to_numpy().all():
                         invalid_columns.append(col)
 
         # Score calculation
@@ -105,11 +131,14 @@ class SemanticQualityService:
     def semantic_consistency(self, df: pd.DataFrame):
         voltage_cols = [col for col in df.columns if "volt" in col.lower()]
         current_cols = [col for col in df.columns if "current" in col.lower()]
-        inconsistent_rows = 0
 
-        for vcol in voltage_cols:
-            for ccol in current_cols:
-                inconsistent_rows += (df[vcol] * df[ccol] < 0).sum()
+        # A (voltage, current) pair is inconsistent when the signs differ, so per row the
+        # count over all pairs is neg_v * pos_c + pos_v * neg_c; NaN and zero count as neither
+        volts = df[voltage_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        currents = df[current_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        v_neg, v_pos = (volts < 0).sum(axis=1), (volts > 0).sum(axis=1)
+        c_neg, c_pos = (currents < 0).sum(axis=1), (currents > 0).sum(axis=1)
+        inconsistent_rows = int(v_neg @ c_pos + v_pos @ c_neg)
 
         total_combinations = len(voltage_cols) * len(current_cols)
         score = 1 - (inconsistent_rows / (len(df) * max(total_combinations, 1))) if len(df) > 0 else 1
@@ -6,39 +6,114 @@ from scipy import stats
 
 class StatisticalQualityService:
 
-    def distribution_normality(self, df, numeric_cols):
+    # Numeric metrics take the block built once per request by `build_numeric_block`:
+    # `num_arr` (rows x numeric_cols, float64) and its shared `col_stats`, extended
+    # with the per-column order statistics and moments from `column_summary`.
+
+    def column_summary(self, num_arr, numeric_cols, col_stats):
+        """Extremes, quartiles, skew and excess kurtosis for every column of the block."""
+        k = len(numeric_cols)
+        valid, count = col_stats["valid"], col_stats["count"]
+        order_stats = ("min", "q1", "median", "q3", "max")
+        summary = {name: np.full(k, np.nan) for name in order_stats}
+        if len(num_arr) > 0 and valid.all():
+            # No gaps: a single partition call covers every column at once
+            for name, values in zip(order_stats, np.percentile(num_arr, [0, 25, 50, 75, 100], axis=0)):
+                summary[name][:] = values
+        else:
+            for j in np.flatnonzero(count):
+                # One partition yields all five order statistics
+                for name, value in zip(order_stats, np.percentile(num_arr[valid[:, j], j], [0, 25, 50, 75, 100])):
+                    summary[name][j] = value
+
+        # Biased central moments (as scipy.stats.skew / kurtosis) for all columns in one
+        # sweep; gaps contribute zero deviation, and the column-major block keeps sums pairwise
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dev = np.where(valid, num_arr - col_stats["mean"], 0.0)
+            sq = dev * dev
+            m2 = sq.sum(axis=0) / count
+            summary["skew"] = (sq * dev).sum(axis=0) / count / m2 ** 1.5
+            summary["kurtosis"] = (sq * sq).sum(axis=0) / count / m2 ** 2 - 3
+        return {**col_stats, **summary}
+
+    def _dagostino_p_values(self, n, skew, kurtosis):
+        """D'Agostino-Pearson K² p-values from sample size and biased moments (scipy.stats.normaltest)."""
+        n = n.astype(np.float64)
+        with np.errstate(all='ignore'):
+            # Skewness test
+            y = skew * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+            beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+            w2 = -1 + np.sqrt(2 * (beta2 - 1))
+            delta = 1 / np.sqrt(0.5 * np.log(w2))
+            alpha = np.sqrt(2.0 / (w2 - 1))
+            y = np.where(y == 0, 1, y)
+            z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+            # Kurtosis test (on Pearson kurtosis)
+            b2 = kurtosis + 3
+            mean_b2 = 3.0 * (n - 1) / (n + 1)
+            var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+            x = (b2 - mean_b2) / np.sqrt(var_b2)
+            sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3)))
+            a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+            denom = 1 + x * np.sqrt(2 / (a - 4.0))
+            term2 = np.sign(denom) * np.where(denom == 0.0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+            z_kurt = ((1 - 2 / (9.0 * a)) - term2) / np.sqrt(2 / (9.0 * a))
+
+            # K² is chi-squared with 2 dof, whose survival function is exp(-K² / 2)
+            return np.exp(-(z_skew ** 2 + z_kurt ** 2) / 2)
+
+    def distribution_normality(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            if len(df[col].dropna()) > 3:
-                stat, p_val = stats.shapiro(df[col].dropna()[:5000])
+        # Closed form from the shared moments: no per-column sort, no 5000-row cap.
+        # The kurtosis test needs n >= 20; smaller and constant columns keep Shapiro-Wilk.
+        p_values = self._dagostino_p_values(col_stats["count"], col_stats["skew"], col_stats["kurtosis"])
+        for j, col in enumerate(numeric_cols):
+            n = col_stats["count"][j]
+            if n > 3:
+                if n >= 20 and col_stats["min"][j] != col_stats["max"][j]:
+                    p_val = p_values[j]
+                else:
+                    stat, p_val = stats.shapiro(num_arr[col_stats["valid"][:, j], j][:5000])
                 result[col] = {
                     "p_value": float(round(p_val, 5)),
                     "status": "Non-normal" if p_val < 0.01 else "Normal"
                 }
         return result
 
-    def outlier_score(self, df, numeric_cols):
+    def outlier_score(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower = Q1 - 1.5 * IQR
-            upper = Q3 + 1.5 * IQR
-            outliers = df[(df[col] < lower) | (df[col] > upper)]
-            percent = (len(outliers) / len(df)) * 100
+        Q1, Q3 = col_stats["q1"], col_stats["q3"]
+        IQR = Q3 - Q1
+        lower = Q1 - 1.5 * IQR
+        upper = Q3 + 1.5 * IQR
+        # Fences broadcast across the block; NaN compares False on both sides,
+        # so gaps never count as outliers
+        outliers = np.count_nonzero((num_arr < lower) | (num_arr > upper), axis=0)
+        for col, count in zip(numeric_cols, outliers):
+            percent = (count / len(num_arr)) * 100
             result[col] = {
                 "outlier_%": float(round(percent, 2)),
                 "status": "Issue" if percent > 5 else "OK"
             }
         return result
 
-    def variance_stability(self, df, numeric_cols):
+    def variance_stability(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            chunks = np.array_split(df[col].dropna(), 5)
-            variances = [chunk.var() for chunk in chunks if len(chunk) > 1]
-            if len(variances) > 1:
+        for j, col in enumerate(numeric_cols):
+            data = num_arr[col_stats["valid"][:, j], j]
+            # The np.array_split(data, 5) boundaries: the first n % 5 chunks hold one extra row.
+            # Sizes never increase, so the chunks with > 1 row are a contiguous prefix.
+            sizes = np.full(5, len(data) // 5)
+            sizes[:len(data) % 5] += 1
+            sizes = sizes[sizes > 1]
+            if len(sizes) > 1:
+                starts = np.cumsum(sizes) - sizes
+                data = data[:sizes.sum()]
+                # Two-pass sample variance of every chunk at once via segment sums
+                means = np.add.reduceat(data, starts) / sizes
+                dev = data - np.repeat(means, sizes)
+                variances = np.add.reduceat(dev * dev, starts) / (sizes - 1)
                 cv = np.std(variances) / np.mean(variances) if np.mean(variances) != 0 else np.nan
                 result[col] = {
                     "cv_variance": float(round(cv, 3)),
@@ -47,17 +122,16 @@ class StatisticalQualityService:
         return result
 
 
-    def skewness_quality(self, df, numeric_cols):
+    def skewness_quality(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            data = df[col].dropna()
-            if len(data) < 2 or data.nunique() == 1:
+        for j, col in enumerate(numeric_cols):
+            if col_stats["count"][j] < 2 or col_stats["min"][j] == col_stats["max"][j]:
                 result[col] = {
                     "skew": None,
                     "status": "No Data / Constant Values"
                 }
             else:
-                skew = stats.skew(data)
+                skew = col_stats["skew"][j]
                 result[col] = {
                     "skew": float(round(skew, 3)),
                     "status": "High Skew" if abs(skew) > 2 else "OK"
@@ -65,17 +139,16 @@ class StatisticalQualityService:
         return result
 
 
-    def kurtosis_quality(self, df, numeric_cols):
+    def kurtosis_quality(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            data = df[col].dropna()
-            if len(data) < 2 or data.nunique() == 1:
+        for j, col in enumerate(numeric_cols):
+            if col_stats["count"][j] < 2 or col_stats["min"][j] == col_stats["max"][j]:
                 result[col] = {
                     "kurtosis": None,
                     "status": "No Data / Constant Values"
                 }
             else:
-                kurt = stats.kurtosis(data)
+                kurt = col_stats["kurtosis"][j]
                 result[col] = {
                     "kurtosis": float(round(kurt, 3)),
                     "status": "High Kurtosis" if abs(kurt) > 7 else "OK"
@@ -84,11 +157,9 @@ class StatisticalQualityService:
 
 
 
-    def coefficient_variation(self, df, numeric_cols):
+    def coefficient_variation(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            mean = df[col].mean()
-            std = df[col].std()
+        for col, mean, std in zip(numeric_cols, col_stats["mean"], col_stats["std"]):
             cv = std / mean if mean != 0 else np.nan
 
             if pd.isna(cv):  # If CV cannot be calculated
@@ -105,34 +176,50 @@ class StatisticalQualityService:
         return result
 
 
-    def statistical_anomalies(self, df, numeric_cols):
+    def statistical_anomalies(self, num_arr, numeric_cols, col_stats):
         result = {}
-        for col in numeric_cols:
-            median = df[col].median()
-            spikes = df[df[col] > median * 5]
-            drops = df[df[col] < median * 0.2]
+        # Thresholds broadcast across the block, so both counts are one sweep each
+        median = col_stats["median"]
+        spikes = np.count_nonzero(num_arr > median * 5, axis=0)
+        drops = np.count_nonzero(num_arr < median * 0.2, axis=0)
+        for col, n_spikes, n_drops in zip(numeric_cols, spikes.tolist(), drops.tolist()):
             result[col] = {
-                "spikes": int(len(spikes)),
-                "drops": int(len(drops)),
-                "status": "Anomalies Found" if len(spikes) + len(drops) > 0 else "OK"
+                "spikes": n_spikes,
+                "drops": n_drops,
+                "status": "Anomalies Found" if n_spikes + n_drops > 0 else "OK"
             }
         return result
 
 
     def range_conformity(self, df, value_ranges):
         result = {}
-        for col, (min_val, max_val) in value_ranges.items():
-            if col in df.columns:
+        cols = [col for col in value_ranges if col in df.columns]
+        numeric = [col for col in cols if pd.api.types.is_numeric_dtype(df[col])]
+
+        # Numeric targets as one slab against broadcast bounds; NaN is neither counted nor in range
+        counts = {}
+        if numeric:
+            arr = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+            lows, highs = np.array([value_ranges[col] for col in numeric], dtype=np.float64).T
+            totals = np.count_nonzero(~np.isnan(arr), axis=0)
+            in_ranges = np.count_nonzero((arr >= lows) & (arr <= highs), axis=0)
+            counts = dict(zip(numeric, zip(totals, in_ranges)))
+
+        for col in cols:
+            if col in counts:
+                total, in_range = counts[col]
+            else:
+                min_val, max_val = value_ranges[col]
                 total = len(df[col].dropna())
-                if total == 0:
-                    result[col] = {"conformity_%": None, "status": "No Data"}
-                    continue
-                in_range = df[col].between(min_val, max_val, inclusive="both").sum()
-                conformity = (in_range / total) * 100
-                result[col] = {
-                    "conformity_%": float(round(conformity, 2)),
-                    "status": "Issue" if conformity < 90 else "OK"
-                }
+                in_range = df[col].between(min_val, max_val, inclusive="both").sum() if total else 0
+            if total == 0:
+                result[col] = {"conformity_%": None, "status": "No Data"}
+                continue
+            conformity = (in_range / total) * 100
+            result[col] = {
+                "conformity_%": float(round(conformity, 2)),
+                "status": "Issue" if conformity < 90 else "OK"
+            }
         return result
 
 
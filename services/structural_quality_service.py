@@ -1,15 +1,19 @@
 import pandas as pd
 import numpy as np
-import re
 
 
 class StructuralQualityService:
+    # Rows per step when scanning object columns for mixed types
+    TYPE_SCAN_BLOCK = 4096
 
     def __init__(self, config):
         self.config = config
         self.expected_schema = config.get("expected_schema", [])
         self.identifier_columns = config.get("identifier_columns", [])
         self.datetime_columns = config.get("datetime_columns", [])
+        # Name sets for the schema checks, hashed once rather than per request
+        self.expected_set = frozenset(self.expected_schema)
+        self.datetime_set = frozenset(self.datetime_columns)
 
     #  Schema Conformity → Expected column detection
     def schema_conformity(self, df: pd.DataFrame):
@@ -22,8 +26,26 @@ class StructuralQualityService:
     def data_type_consistency(self, df: pd.DataFrame):
         inconsistent_columns = []
         for col in df.columns:
-            inferred_type = pd.api.types.infer_dtype(df[col], skipna=True)
-            unique_types = df[col].map(type).nunique()
+            series = df[col]
+            kind = series.dtype.kind if isinstance(series.dtype, np.dtype) else None
+            if kind and kind in "biufc":
+                # NumPy numeric columns box every value (NaN included) to one Python type
+                unique_types = int(len(series) > 0)
+            elif kind and kind in "mM":
+                # Datetime-like values box to Timestamp/Timedelta, missing ones to NaT
+                missing = series.isna()
+                unique_types = int((~missing).any()) + int(missing.any())
+            elif kind == "O":
+                # Mixed Python types can only live here; collect them a block at a time
+                # (C-level set/map) and stop at the first block that shows a second type
+                values, types = series.to_numpy(), set()
+                for start in range(0, len(values), self.TYPE_SCAN_BLOCK):
+                    types.update(map(type, values[start:start + self.TYPE_SCAN_BLOCK]))
+                    if len(types) > 1:
+                        break
+                unique_types = len(types)
+            else:
+                unique_types = series.map(type).nunique()
             if unique_types > 1:
                 inconsistent_columns.append(col)
 
@@ -33,28 +55,29 @@ class StructuralQualityService:
 
     #  Naming Convention → Regex pattern check
     def naming_convention(self, df: pd.DataFrame):
-        pattern = re.compile(r"^[a-zA-Z0-9_]+$")
-        invalid_names = [col for col in df.columns if not pattern.match(col) or len(col) > 50]
+        # Vectorised over the column Index; str.match anchors like re.match
+        names = pd.Index(df.columns)
+        valid = names.str.match(r"^[a-zA-Z0-9_]+$") & (names.str.len() <= 50)
+        invalid_names = names[~valid].tolist()
         score = 1 - (len(invalid_names) / len(df.columns))
         status = "Issue" if score < 0.7 else "OK"
         return {"invalid_columns": invalid_names, "naming_score": round(score, 2), "status": status}
 
     #  Structural Integrity → Compare cardinalities of identifier columns
-    def structural_integrity(self, df: pd.DataFrame):
+    def structural_integrity(self, df: pd.DataFrame, identifier_columns: list):
         if not self.identifier_columns:
             return {"status": "No identifier columns configured"}
-        cardinalities = {col: df[col].nunique() for col in self.identifier_columns if col in df.columns}
+        cardinalities = df[identifier_columns].nunique().to_dict()
         consistent = len(set(cardinalities.values())) == 1
         status = "OK" if consistent else "Inconsistent"
         return {"cardinalities": cardinalities, "status": status}
 
     #  Cardinality Quality → Unique ratio
-    def cardinality_quality(self, df: pd.DataFrame):
+    def cardinality_quality(self, df: pd.DataFrame, identifier_columns: list):
         ratios = {}
-        for col in self.identifier_columns:
-            if col in df.columns:
-                ratio = df[col].nunique() / len(df) if len(df) > 0 else 0
-                ratios[col] = round(ratio, 2)
+        for col, nunique in df[identifier_columns].nunique().items():
+            ratio = nunique / len(df) if len(df) > 0 else 0
+            ratios[col] = round(ratio, 2)
         low_cardinality = [col for col, val in ratios.items() if val < 0.5]
         status = "OK" if not low_cardinality else "Low cardinality issue"
         return {"unique_ratios": ratios, "low_cardinality_columns": low_cardinality, "status": status}
@@ -62,15 +85,14 @@ class StructuralQualityService:
     #  Schema Drift → Detect unexpected or missing columns
     def schema_drift(self, df: pd.DataFrame):
         current_cols = set(df.columns)
-        expected_cols = set(self.expected_schema)
-        new_cols = list(current_cols - expected_cols)
-        missing_cols = list(expected_cols - current_cols)
+        new_cols = list(current_cols - self.expected_set)
+        missing_cols = list(self.expected_set - current_cols)
         status = "OK" if not new_cols and not missing_cols else "Drift Detected"
         return {"new_columns": new_cols, "missing_columns": missing_cols, "status": status}
 
     #  Metadata Completeness → Check min columns and datetime
     def metadata_completeness(self, df: pd.DataFrame):
-        datetime_present = any(col in df.columns for col in self.datetime_columns)
+        datetime_present = not self.datetime_set.isdisjoint(df.columns)
         sufficient_columns = len(df.columns) >= 5
         status = "OK" if datetime_present and sufficient_columns else "Issue"
         return {"datetime_present": datetime_present, "column_count": len(df.columns), "status": status}
@@ -6,6 +6,29 @@ class TemporalQualityService:
     def __init__(self):
         pass
 
+    #  Helper: Parse every datetime column once for all metrics below
+    def parse_datetimes(self, df, datetime_columns):
+        return {col: pd.to_datetime(df[col], errors='coerce') for col in datetime_columns}
+
+    #  Helper: Seconds between consecutive (sorted, non-null) timestamps
+    def _gap_seconds(self, parsed):
+        if not pd.api.types.is_datetime64_any_dtype(parsed):
+            # Mixed offsets stay as Timestamp objects; only pandas can diff those
+            return parsed.dropna().sort_values().diff().dt.total_seconds().dropna().to_numpy()
+        if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            parsed = parsed.dt.tz_convert(None)
+        # Sort and subtract the raw int64 storage; dividing by one second keeps the column's unit.
+        # The NaT mask already yields a private copy, so it is sorted in place
+        times = parsed.to_numpy()
+        times = times[~np.isnat(times)]
+        times.sort()
+        return np.diff(times) / np.timedelta64(1, 's')
+
+    #  Helper: Rows per hour of day, for the hours that occur (as value_counts would)
+    def _hour_counts(self, parsed):
+        counts = np.bincount(parsed.dt.hour.to_numpy(), minlength=24)
+        return counts[counts > 0]
+
     #  Helper: Detect valid datetime columns
     def _get_datetime_columns(self, df, datetime_columns):
         detected = []
@@ -17,10 +40,9 @@ class TemporalQualityService:
         return detected
 
     #  1. Timestamp Accuracy
-    def timestamp_accuracy(self, df, datetime_columns):
+    def timestamp_accuracy(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce')
+        for col, parsed in parsed_columns.items():
             total = len(parsed)
             valid = parsed.notna().sum()
             accuracy = round((valid / total) * 100, 2) if total > 0 else 0
@@ -31,16 +53,15 @@ class TemporalQualityService:
         return results
 
     #  2. Temporal Continuity (Gap detection)
-    def temporal_continuity(self, df, datetime_columns):
+    def temporal_continuity(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce').dropna().sort_values()
-            if len(parsed) < 2:
+        for col, parsed in parsed_columns.items():
+            if parsed.count() < 2:
                 results[col] = {"continuity_%": 0, "status": "Issue"}
                 continue
 
-            diffs = parsed.diff().dt.total_seconds().dropna()
-            median_gap = diffs.median() if len(diffs) > 0 else 0
+            diffs = self._gap_seconds(parsed)
+            median_gap = np.median(diffs) if len(diffs) > 0 else 0
             gap_ratio = (diffs > median_gap * 2).mean() if median_gap > 0 else 0
             continuity = round((1 - gap_ratio) * 100, 2)
 
@@ -51,16 +72,15 @@ class TemporalQualityService:
         return results
 
     #  3. Time Zone Consistency
-    def time_zone_consistency(self, df, datetime_columns):
+    def time_zone_consistency(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce')
-
-            # Get timezone info for each row (if available)
-            tz_series = parsed.apply(lambda x: x.tzinfo if pd.notna(x) else None)
-
-            # Count unique non-null timezones
-            unique_tz = tz_series.dropna().unique()
+        for col, parsed in parsed_columns.items():
+            # A datetime64 column holds at most one zone (naive or tz-aware dtype), so the
+            # dtype answers it; only mixed offsets come back as object and need a row scan
+            if pd.api.types.is_datetime64_any_dtype(parsed):
+                unique_tz = [parsed.dt.tz] if parsed.dt.tz is not None and parsed.notna().any() else []
+            else:
+                unique_tz = {getattr(x, "tzinfo", None) for x in parsed.to_numpy()} - {None}
 
             if len(unique_tz) == 0:
                 # No timezone info at all → assume consistent (but naive)
@@ -83,15 +103,15 @@ class TemporalQualityService:
 
 
     # 4. Temporal Granularity (Regularity of intervals)
-    def temporal_granularity(self, df, datetime_columns):
+    def temporal_granularity(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce').dropna().sort_values()
-            diffs = parsed.diff().dt.total_seconds().dropna()
+        for col, parsed in parsed_columns.items():
+            diffs = self._gap_seconds(parsed)
             if len(diffs) == 0:
                 granularity = 0
             else:
-                std_ratio = diffs.std() / diffs.mean() if diffs.mean() > 0 else np.inf
+                gap_std = diffs.std(ddof=1) if len(diffs) > 1 else np.nan
+                std_ratio = gap_std / diffs.mean() if diffs.mean() > 0 else np.inf
                 granularity = round(max(0, (1 - std_ratio) * 100), 2)
 
             results[col] = {
@@ -101,17 +121,23 @@ class TemporalQualityService:
         return results
 
     # 5. Freshness Score
-    def freshness_score(self, df, datetime_columns):
+    def freshness_score(self, parsed_columns):
         results = {}
         now = datetime.now()
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce')
-            latest = parsed.max()
+        for col, parsed in parsed_columns.items():
+            if pd.api.types.is_datetime64_dtype(parsed):
+                # Naive datetime64: max over the raw storage, whole days by floor division
+                times = parsed.to_numpy()
+                times = times[~np.isnat(times)]
+                latest = None if times.size == 0 else times.max()
+                diff_days = None if latest is None else int((np.datetime64(now) - latest) // np.timedelta64(1, 'D'))
+            else:
+                latest = parsed.max()
+                diff_days = None if pd.isna(latest) else (now - latest).days
 
-            if pd.isna(latest):
+            if diff_days is None:
                 score = 0
             else:
-                diff_days = (now - latest).days
                 score = max(0, 100 - diff_days)
 
             results[col] = {
@@ -121,17 +147,19 @@ class TemporalQualityService:
         return results
 
     # ✅ 6. Temporal Pattern Detection (Better than fixed 75%)
-    def temporal_pattern(self, df, datetime_columns):
+    def temporal_pattern(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce').dropna()
+        for col, parsed in parsed_columns.items():
+            parsed = parsed.dropna()
             if parsed.empty:
                 results[col] = {"pattern_score_%": 0, "status": "Issue"}
                 continue
 
             # Hour-based cyclic pattern assumption
-            hour_counts = parsed.dt.hour.value_counts(normalize=True)
-            pattern_score = round((1 - hour_counts.std()) * 100, 2)
+            hour_counts = self._hour_counts(parsed)
+            hour_shares = hour_counts / hour_counts.sum()
+            hour_std = hour_shares.std(ddof=1) if len(hour_shares) > 1 else np.nan
+            pattern_score = round((1 - hour_std) * 100, 2)
 
             results[col] = {
                 "pattern_score_%": pattern_score,
@@ -140,18 +168,19 @@ class TemporalQualityService:
         return results
 
     # ✅ 7. Seasonality Detection (Daily/Weekly/Monthly repetitions)
-    def seasonality_detection(self, df, datetime_columns):
+    def seasonality_detection(self, parsed_columns):
         results = {}
-        for col in datetime_columns:
-            parsed = pd.to_datetime(df[col], errors='coerce').dropna()
+        for col, parsed in parsed_columns.items():
+            parsed = parsed.dropna()
             if len(parsed) < 10:
                 results[col] = {"seasonality_%": 0, "status": "Issue"}
                 continue
 
             # Test DAILY seasonality (count per hour per day)
-            daily_pattern = parsed.groupby(parsed.dt.hour).size()
+            daily_pattern = self._hour_counts(parsed)
             if daily_pattern.mean() > 0:
-                seasonality_strength = round((1 - daily_pattern.std() / daily_pattern.mean()) * 100, 2)
+                daily_std = daily_pattern.std(ddof=1) if len(daily_pattern) > 1 else np.nan
+                seasonality_strength = round((1 - daily_std / daily_pattern.mean()) * 100, 2)
             else:
                 seasonality_strength = 0
 
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from services.precision_quality_service import PrecisionQualityService
+
+
+def str_decimal_places(value):
+    text = str(value)
+    return len(text.split(".")[1]) if "." in text else 0
+
+
+class DecimalPlacesTest(unittest.TestCase):
+    def setUp(self):
+        self.service = PrecisionQualityService()
+
+    def assert_matches_str(self, vals):
+        expected = np.array([str_decimal_places(float(v)) for v in vals])
+        got = self.service._decimal_places(vals, False)
+        mismatched = np.flatnonzero(got != expected)
+        self.assertEqual(mismatched.size, 0, f"e.g. {vals[mismatched[:5]].tolist()}")
+
+    def test_large_magnitudes_match_str(self):
+        # Near 2**53 the rounding test overcounts; these must go through the string path
+        self.assert_matches_str(np.array([983557499123.4567, 96396808678.48413]))
+
+    def test_random_full_precision_values_match_str(self):
+        rng = np.random.default_rng(0)
+        magnitude = 10 ** rng.uniform(6, 15, 100_000)
+        self.assert_matches_str(magnitude * rng.choice([-1, 1], magnitude.size))
+
+    def test_rounded_values_match_str(self):
+        rng = np.random.default_rng(1)
+        vals = np.concatenate([np.round(10 ** rng.uniform(-4, 15, 5_000), d) for d in range(12)])
+        self.assert_matches_str(np.concatenate([vals, [0.0, -0.0, 1e16, 1e-5, 0.1 + 0.2, np.inf]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
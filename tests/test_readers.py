@@ -0,0 +1,29 @@
+import io
+import unittest
+import warnings
+
+from main import READERS
+from services.temporal_quality_service import TemporalQualityService
+
+
+class CsvReaderTest(unittest.TestCase):
+    def read_csv(self, text):
+        return READERS[".csv"](io.BytesIO(text.encode()))
+
+    def test_mixed_utc_offsets_stay_visible(self):
+        rows = ["2024-01-01 00:00:00+05:30", "2024-01-01 01:00:00+00:00"] * 3
+        df = self.read_csv("Datetime,v\n" + "".join(f"{ts},{i}\n" for i, ts in enumerate(rows)))
+        service = TemporalQualityService()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = service.parse_datetimes(df, ["Datetime"])
+        result = service.time_zone_consistency(parsed)["Datetime"]
+        self.assertEqual(result, {"timezone_consistency_%": 70.0, "status": "Issue"})
+
+    def test_header_only_file_has_no_numeric_columns(self):
+        df = self.read_csv("Datetime,cat,v\n")
+        self.assertEqual(df.select_dtypes(include=["int", "float"]).columns.tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from services.semantic_quality_service import SemanticQualityService
+
+
+class DomainValueValidityTest(unittest.TestCase):
+    def invalid_columns(self, rules, df):
+        return SemanticQualityService({"domain_rules": rules}).domain_value_validity(df)["invalid_columns"]
+
+    def test_allowed_values_may_include_none(self):
+        df = pd.DataFrame({"cat": ["a", "b", None, "c"]})
+        self.assertEqual(self.invalid_columns({"cat": ["a", "b", "c", None]}, df), [])
+
+    def test_text_bounds_skip_missing_values(self):
+        df = pd.DataFrame({"code": ["b", np.nan, "c"]})
+        self.assertEqual(self.invalid_columns({"code": ["a", "z"]}, df), [])
+
+    def test_numeric_bounds(self):
+        df = pd.DataFrame({"freq": [49.5, np.nan, 52.0], "pf": [0.9, -0.5, np.nan]})
+        self.assertEqual(self.invalid_columns({"freq": [49.0, 51.5], "pf": [-1.0, 1.0]}, df), ["freq"])
+
+
+if __name__ == "__main__":
+    unittest.main()
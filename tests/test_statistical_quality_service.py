@@ -0,0 +1,54 @@
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from services.numeric_block import build_numeric_block
+from services.statistical_quality_service import StatisticalQualityService
+
+
+class DistributionNormalityTest(unittest.TestCase):
+    def p_values(self, df):
+        service = StatisticalQualityService()
+        cols = df.columns.tolist()
+        num_arr, col_stats = build_numeric_block(df, cols)
+        col_stats = service.column_summary(num_arr, cols, col_stats)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = service.distribution_normality(num_arr, cols, col_stats)
+        return {col: value["p_value"] for col, value in result.items()}
+
+    def assert_matches_normaltest(self, df):
+        for col, p_value in self.p_values(df).items():
+            expected = stats.normaltest(df[col].dropna()).pvalue
+            self.assertAlmostEqual(p_value, expected, delta=1e-5, msg=col)
+
+    def test_matches_normaltest_at_small_sizes(self):
+        rng = np.random.default_rng(0)
+        for n in (20, 21):
+            df = pd.DataFrame({"normal": rng.normal(size=n), "skewed": rng.exponential(size=n) ** 2})
+            self.assert_matches_normaltest(df)
+
+    def test_matches_normaltest_on_large_column(self):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({"normal": rng.normal(size=20_000), "heavy": rng.standard_t(5, size=20_000)})
+        self.assert_matches_normaltest(df)
+
+    def test_matches_normaltest_with_gaps(self):
+        rng = np.random.default_rng(2)
+        values = rng.normal(size=500)
+        values[rng.random(500) < 0.3] = np.nan
+        self.assert_matches_normaltest(pd.DataFrame({"gappy": values, "dense": rng.gamma(2.0, size=500)}))
+
+    def test_constant_column_falls_back_to_shapiro(self):
+        df = pd.DataFrame({"const": np.full(50, 3.5)})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = stats.shapiro(df["const"]).pvalue
+        self.assertEqual(self.p_values(df)["const"], round(float(expected), 5))
+
+
+if __name__ == "__main__":
+    unittest.main()